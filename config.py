@@ -4,24 +4,39 @@ Configuration file for database connections.
 """
 
 from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Dict
 import os
 
-# Load environment variables from .env
-# (Загрузка переменных окружения из файла .env)
-load_dotenv()
+@lru_cache(maxsize=1)
+def _env() -> Dict[str, str]:
+    """
+    Loads environment variables from .env once and returns a snapshot.
+    (Однократно загружает переменные окружения из .env и возвращает их копию.)
+
+    Returns:
+        Dict[str, str]: Copy of os.environ after loading .env.
+            (Копия os.environ после загрузки .env.)
+    """
+    load_dotenv()
+    return os.environ.copy()
+
+_ENV = _env()
 
 # MySQL configuration (Настройки для MySQL)
 MYSQL_CONFIG = {
-    "host":       os.getenv('MYSQL_HOST'),
-    "user":       os.getenv('MYSQL_USER'),
-    "password":   os.getenv('MYSQL_PASSWORD'),
-    "database":   os.getenv('MYSQL_DATABASE'),
+    "host":       _ENV.get('MYSQL_HOST'),
+    "user":       _ENV.get('MYSQL_USER'),
+    "password":   _ENV.get('MYSQL_PASSWORD'),
+    "database":   _ENV.get('MYSQL_DATABASE'),
     "charset":    "utf8mb4",
     "use_unicode": True
 }
 
 # MongoDB configuration (Настройки для MongoDB)
-MONGO_URI = os.getenv('MONGO_URI')
-MONGO_DB_NAME = os.getenv('MONGO_DB_NAME')
-MONGO_COLLECTION = os.getenv('MONGO_COLLECTION')
+MONGO_URI = _ENV.get('MONGO_URI')
+MONGO_DB_NAME = _ENV.get('MONGO_DB_NAME')
+MONGO_COLLECTION = _ENV.get('MONGO_COLLECTION')
 
+# Logging configuration (Настройки логирования)
+LOG_LEVEL = _ENV.get('LOG_LEVEL', 'info')
@@ -6,17 +6,49 @@ Provides tabular output using the tabulate library for movie and log results.
 (Использует библиотеку tabulate для табличного вывода логов и фильмов.)
 """
 
-from typing import List, Dict, Any
-from tabulate import tabulate
+from typing import List, Dict, Any, Iterable, Tuple, Union, Callable
+from operator import itemgetter, attrgetter
+from itertools import chain
+from functools import lru_cache
+from datetime import datetime
 
-def format_results(data: List[Dict[str, Any]], mode: str = "logs") -> None:
+# === Table headers and row extractors (Заголовки таблиц и извлечение полей) ===
+LOG_HEADERS: List[str] = ["Время", "Тип запроса", "Параметры"]
+MOVIE_HEADERS: List[str] = ["Название", "Год", "Рейтинг"]
+_get_log_fields = itemgetter("timestamp", "event_type", "params")
+_get_movie_fields = attrgetter("title", "release_year", "rating")
+
+def _get_movie_items(row: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    """
+    Reads movie fields from a dict row; missing keys give None (shown as "—").
+    (Читает поля фильма из словаря; отсутствующие ключи дают None — выводится "—".)
+    """
+    return row.get("title"), row.get("release_year"), row.get("rating")
+
+TIMESTAMP_FORMAT: str = "%Y-%m-%d %H:%M:%S"  # Формат времени в таблице логов
+PLAIN_TABLE_THRESHOLD: int = 50              # Больше строк — простой вывод без рамок
+
+# Known search parameters in display order (Известные параметры поиска в порядке вывода)
+_PARAM_ORDER = ("keyword", "genre", "year_from", "year_to")
+_PARAM_KEYS = frozenset(_PARAM_ORDER)
+
+def format_results(data: Union[Iterable[Any], Dict[str, List[Any]]], mode: str = "logs") -> None:
     """
     Formats and prints results as a table depending on the mode.
     (Форматирует и выводит результаты в виде таблицы в зависимости от режима.)
 
     Args:
-        data (List[Dict[str, Any]]): List of result entries as dictionaries.
-                                    (Список записей результатов в виде словарей.)
+        data (Union[Iterable[Any], Dict[str, List[Any]]]): Result entries:
+                             dictionaries or a dict of columns for "logs",
+                             film records (e.g. FilmRecord) or dictionaries
+                             with 'title', 'release_year', 'rating' for "movies";
+                             any iterable (list, cursor, generator) is consumed
+                             in a single pass.
+                             (Записи результатов: словари или словарь столбцов
+                             для "logs", записи фильмов (например, FilmRecord)
+                             или словари с 'title', 'release_year', 'rating'
+                             для "movies"; любой итерируемый объект читается
+                             за один проход.)
         mode (str): Display mode: "logs" for logs/statistics,
                     "movies" for film search results.
                     (Режим отображения: "logs" — для логов/статистики,
@@ -25,65 +57,149 @@ def format_results(data: List[Dict[str, Any]], mode: str = "logs") -> None:
     Returns:
         None
     """
-    if not data:
+    if mode == "logs":
+        # Statistics come as columns (dict of lists) or as row dicts
+        # (Статистика передаётся столбцами (словарь списков) или словарями строк)
+        data = zip(*_get_log_fields(data)) if isinstance(data, dict) else map(_get_log_fields, data)
+
+    # Peek at the first entry so empty input never reaches the row builders
+    # (Проверяем первую запись, чтобы пустые данные не шли в построение таблицы)
+    items = iter(data)
+    first = next(items, None)
+    if first is None:
         print("Нет данных для отображения.")
         return
+    data = chain((first,), items)
     if mode == "logs":
         _print_log_table(data)
     elif mode == "movies":
-        _print_movie_table(data)
+        # Records with attributes or plain dicts (Записи с атрибутами или словари)
+        getter = _get_movie_items if isinstance(first, dict) else _get_movie_fields
+        _print_movie_table(map(getter, data))
     else:
         print(f"[ОШИБКА] Неизвестный режим отображения: '{mode}'")
 
-def _print_log_table(data: List[Dict[str, Any]]) -> None:
+def _print_log_table(data: Iterable[Tuple[Any, Any, Any]]) -> None:
     """
     Prints logs/statistics in tabular format.
     (Выводит логи или статистику запросов в табличной форме.)
 
     Args:
-        data (List[Dict[str, Any]]): List of log/statistic entries.
-                                    (Список записей логов или статистики.)
+        data (Iterable[Tuple[Any, Any, Any]]): (timestamp, event_type, params)
+                                              of log/statistic entries.
+                                              (Время, тип и параметры записей.)
 
     Returns:
         None
     """
-    headers = ["Время", "Тип запроса", "Параметры"]
     rows = []
-    for row in data:
-        timestamp = row.get("timestamp", "—") or "—"
-        event_type = row.get("event_type", "—") or "—"
-        params = row.get("params", "") or ""
-
+    for timestamp, event_type, params in data:
         # Convert dict params to readable string
         if isinstance(params, dict):
-            params = ', '.join(f"{k}: {v}" for k, v in params.items())
+            params = _format_params(params)
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.strftime(TIMESTAMP_FORMAT)
+        rows.append([str(timestamp or "—"), str(event_type or "—"), str(params or "")])
+    _print_table("Статистика запросов", rows, LOG_HEADERS)
 
-        rows.append([timestamp, event_type, params])
-    print("\nСтатистика запросов:")
-    print(tabulate(rows, headers=headers, tablefmt="grid"))
+def _format_params(params: Dict[str, Any]) -> str:
+    """
+    Converts search parameters to a readable "key: value" string.
+    (Преобразует параметры поиска в строку вида "ключ: значение".)
 
-def _print_movie_table(data: List[Dict[str, Any]]) -> None:
+    Args:
+        params (Dict[str, Any]): Search parameters. (Параметры поиска)
+
+    Returns:
+        str: Parameters joined with ", ". (Параметры через ", ")
+    """
+    if params.keys() <= _PARAM_KEYS:
+        # Fixed search schema: walk the known keys in a stable order
+        # (Известная схема поиска: обход ключей в фиксированном порядке)
+        return ", ".join(f"{k}: {params[k]}" for k in _PARAM_ORDER if k in params)
+    return ", ".join(f"{k}: {v}" for k, v in params.items())
+
+def _print_movie_table(data: Iterable[Tuple[Any, Any, Any]]) -> None:
     """
     Prints movie search results in tabular format.
     (Выводит найденные фильмы в виде таблицы.)
 
     Args:
-        data (List[Dict[str, Any]]): List of movies with keys:
-                                    'title', 'release_year', 'rating'.
-                                    (Список фильмов с ключами:
-                                    'title' — название,
-                                    'release_year' — год выпуска,
-                                    'rating' — рейтинг.)
+        data (Iterable[Tuple[Any, Any, Any]]): (title, release_year, rating)
+                                              of each movie.
+                                              (Название, год выпуска и рейтинг
+                                              каждого фильма.)
 
     Returns:
         None
     """
-    headers = ["Название", "Год", "Рейтинг"]
-    rows = []
-    for row in data:
-        title = row.get("title", "—") or "—"
-        year = row.get("release_year", "—") or "—"
-        rating = row.get("rating", "—") or "—"
-        rows.append([title, year, rating])
-    print("\nНайденные фильмы:")
-    print(tabulate(rows, headers=headers, tablefmt="grid"))
\ No newline at end of file
+    # Fields are unpacked without an inner comprehension; cells are
+    # stringified once here, not per render
+    # (Поля распаковываются без вложенного генератора; значения переводятся
+    # в строки один раз здесь, а не при каждом выводе)
+    rows = [
+        [title or "—", str(year) if year else "—", rating or "—"]
+        for title, year, rating in data
+    ]
+    _print_table("Найденные фильмы", rows, MOVIE_HEADERS)
+
+@lru_cache(maxsize=1)
+def _get_tabulate() -> Callable[..., str]:
+    """
+    Imports tabulate on first use, so output that never draws a grid table
+    (empty results, single rows) does not load it.
+    (Импортирует tabulate при первом использовании: вывод без таблицы
+    в рамке — пустой результат, одна строка — не загружает библиотеку.)
+
+    Returns:
+        Callable[..., str]: tabulate function. (Функция tabulate)
+    """
+    from tabulate import tabulate
+    return tabulate
+
+def _plain_table(rows: List[List[str]], headers: List[str]) -> str:
+    """
+    Renders rows as left-aligned columns without borders, measuring each
+    column once.
+    (Формирует столбцы с выравниванием влево без рамок; ширина каждого
+    столбца вычисляется один раз.)
+
+    Args:
+        rows (List[List[str]]): Table rows of strings. (Строки таблицы из строковых значений)
+        headers (List[str]): Column headers. (Заголовки столбцов)
+
+    Returns:
+        str: Rendered table. (Готовая таблица)
+    """
+    widths = [max(map(len, column)) for column in zip(headers, *rows)]
+    return "\n".join(
+        "  ".join(f"{v:<{w}}" for v, w in zip(line, widths)).rstrip()
+        for line in (headers, *rows)
+    )
+
+def _print_table(title: str, rows: List[List[str]], headers: List[str]) -> None:
+    """
+    Prints a title and rows as a grid table in a single write; a single row
+    is printed as plain text without invoking tabulate, and more than
+    PLAIN_TABLE_THRESHOLD rows as plain columns without borders.
+    (Выводит заголовок и строки в виде таблицы одной записью; одна строка
+    печатается простым текстом без вызова tabulate, а больше
+    PLAIN_TABLE_THRESHOLD строк — простыми столбцами без рамок.)
+
+    Args:
+        title (str): Table title. (Заголовок таблицы)
+        rows (List[List[str]]): Table rows of strings. (Строки таблицы из строковых значений)
+        headers (List[str]): Column headers. (Заголовки столбцов)
+
+    Returns:
+        None
+    """
+    if len(rows) == 1:
+        table = " | ".join(f"{h}: {v}" for h, v in zip(headers, rows[0]))
+    elif len(rows) > PLAIN_TABLE_THRESHOLD:
+        table = _plain_table(rows, headers)
+    else:
+        # Cells are already strings: skip tabulate's per-cell number detection
+        # (Значения уже строки: пропускаем распознавание чисел в каждой ячейке)
+        table = _get_tabulate()(rows, headers=headers, tablefmt="grid", disable_numparse=True)
+    print(f"\n{title}:\n{table}")
@@ -8,10 +8,209 @@ from MongoDB logs with detailed aggregation pipelines and error handling.
 из логов MongoDB с использованием агрегатных запросов и обработкой ошибок.)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from pymongo.command_cursor import CommandCursor
 from log_writer import MongoLogger
+import logging
+import time
 
-def get_top_searches(logger: Optional[MongoLogger] = None) -> List[Dict[str, Any]]:
+# Diagnostics for stats calls stay in-process and are never written to MongoDB
+# (Диагностика статистики не записывается в MongoDB, чтобы не искажать её)
+_log = logging.getLogger(__name__)
+
+# === Constant: statistics time window ===
+STATS_WINDOW_DAYS: int = 30  # Глубина выборки логов для статистики (в днях)
+_STATS_WINDOW_MS: int = STATS_WINDOW_DAYS * 86_400_000  # То же окно в миллисекундах
+
+# === Constant: number of rows per statistic ===
+STATS_LIMIT: int = 5  # Количество записей в каждой статистике
+
+# === Constant: statistics cache lifetime ===
+STATS_CACHE_TTL: float = 30.0  # Время жизни кэша статистики (сек.)
+
+# === Columnar statistics shape ===
+STATS_COLUMNS: Tuple[str, ...] = ("timestamp", "event_type", "params")  # Столбцы статистики
+
+# Statistics as columns: name -> values (Статистика по столбцам: имя -> значения)
+StatsColumns = Dict[str, List[Any]]
+
+# Cached statistics: key -> (expires_at, events_logged, value)
+# (Кэш статистики: ключ -> (срок, число записанных событий, значение))
+_STATS_CACHE: Dict[str, Tuple[float, int, Any]] = {}
+
+def _cache_get(key: str, logger: MongoLogger) -> Optional[Any]:
+    """
+    Returns a cached statistics value if it has not expired and nothing has
+    been logged since it was computed, so a new search is counted at once.
+    (Возвращает закэшированное значение статистики, если срок не истёк и
+    с момента расчёта ничего не записывалось — новый поиск учитывается сразу.)
+    """
+    entry = _STATS_CACHE.get(key)
+    if entry and time.monotonic() < entry[0] and entry[1] == logger.events_logged:
+        return entry[2]
+    return None
+
+def _cache_put(key: str, value: Any, logger: MongoLogger) -> None:
+    """
+    Stores a statistics value in the cache for STATS_CACHE_TTL seconds.
+    (Сохраняет значение статистики в кэше на STATS_CACHE_TTL секунд.)
+    """
+    _STATS_CACHE[key] = (time.monotonic() + STATS_CACHE_TTL, logger.events_logged, value)
+
+# === Pipeline stages shared by stats functions and the $facet dashboard ===
+_SEARCH_EVENTS: List[str] = ["search_by_keyword", "search_by_genre_year"]
+
+def _search_match(event_types: List[str]) -> Dict[str, Any]:
+    """
+    Builds the opening $match stage for the given event types. The time
+    window is computed server-side from $$NOW, so the stage is a constant.
+    (Формирует начальный этап $match по типам событий. Временное окно
+    вычисляется на сервере через $$NOW, поэтому этап неизменен.)
+
+    Args:
+        event_types (List[str]): Event types to select. (Типы событий для выборки)
+
+    Returns:
+        Dict[str, Any]: $match pipeline stage. (Этап $match)
+    """
+    return {"$match": {
+        "event_type": {"$in": event_types},
+        "$expr": {"$gte": ["$timestamp", {"$subtract": ["$$NOW", _STATS_WINDOW_MS]}]}
+    }}
+
+# Keep only the fields the group stages read (Оставляем только поля, нужные для $group)
+_SEARCH_PROJECT: Dict[str, Any] = {"$project": {
+    "_id": 0,
+    "event_type": 1,
+    "data.keyword": 1,
+    "data.genre": 1,
+    "data.year_from": 1,
+    "data.year_to": 1,
+    "timestamp": 1
+}}
+
+_TOP_STAGES: List[Dict[str, Any]] = [
+    {"$group": {
+        "_id": {
+            "type": "$event_type",
+            "keyword": "$data.keyword",
+            "genre": "$data.genre",
+            "year_from": "$data.year_from",
+            "year_to": "$data.year_to"
+        },
+        "count": {"$sum": 1},
+        "timestamp": {"$max": "$timestamp"}
+    }},
+    {"$sort": {"count": -1}},
+    {"$limit": STATS_LIMIT}
+]
+
+_RECENT_STAGES: List[Dict[str, Any]] = [
+    {"$match": {"event_type": "search_by_keyword"}},
+    {"$group": {
+        "_id": "$data.keyword",
+        "timestamp": {"$max": "$timestamp"}
+    }},
+    # $sort directly followed by $limit lets MongoDB keep only the top 5
+    # (Соседние $sort + $limit — сервер хранит только топ-5 документов)
+    {"$sort": {"timestamp": -1}},
+    {"$limit": STATS_LIMIT}
+]
+
+# Pipelines are built once at import and reused on every call
+# (Конвейеры собираются один раз при импорте и переиспользуются)
+_TOP_PIPELINE: List[Dict[str, Any]] = [
+    _search_match(_SEARCH_EVENTS),
+    _SEARCH_PROJECT,
+    *_TOP_STAGES
+]
+
+_RECENT_PIPELINE: List[Dict[str, Any]] = [
+    _search_match(["search_by_keyword"]),
+    _SEARCH_PROJECT,
+    *_RECENT_STAGES
+]
+
+_DASHBOARD_PIPELINE: List[Dict[str, Any]] = [
+    _search_match(_SEARCH_EVENTS),
+    _SEARCH_PROJECT,
+    {"$facet": {"top": _TOP_STAGES, "recent": _RECENT_STAGES}}
+]
+
+def _aggregate(logger: MongoLogger, pipeline: List[Dict[str, Any]], batch_size: int = STATS_LIMIT) -> CommandCursor:
+    """
+    Runs a stats aggregation with options matched to its small result size.
+    (Выполняет агрегацию статистики с параметрами под небольшой результат.)
+
+    The cursor batch size matches the expected number of rows, the
+    event_type/timestamp index is forced via hint (by name, and only if the
+    logger created it), and disk spills are disabled so an unbounded stage
+    fails loudly instead of slowing down.
+    (Размер пачки курсора равен ожидаемому числу строк, индекс
+    event_type/timestamp задаётся через hint (по имени и только если логгер
+    его создал), запись на диск отключена — неограниченный этап приведёт
+    к ошибке, а не к замедлению.)
+
+    Args:
+        logger (MongoLogger): Connected logger instance. (Подключённый логгер)
+        pipeline (List[Dict[str, Any]]): Aggregation pipeline. (Конвейер агрегации)
+        batch_size (int): Cursor batch size. (Размер пачки курсора)
+
+    Returns:
+        CommandCursor: Aggregation cursor. (Курсор результата агрегации)
+    """
+    # aggregate sends hint as-is: the server accepts an index name or document
+    # (aggregate передаёт hint без изменений: сервер принимает имя или документ индекса)
+    options = {"hint": logger.stats_index} if logger.stats_index else {}
+    return logger.collection.aggregate(
+        pipeline,
+        batchSize=batch_size,
+        allowDiskUse=False,
+        **options
+    )
+
+def _rows_to_columns(rows: Iterable[Tuple[Any, ...]]) -> StatsColumns:
+    """
+    Transposes display rows into columns keyed by STATS_COLUMNS.
+    (Транспонирует строки для отображения в столбцы с ключами из STATS_COLUMNS.)
+
+    Args:
+        rows (Iterable[Tuple[Any, ...]]): (timestamp, event_type, params) rows.
+            (Строки вида (время, тип, параметры))
+
+    Returns:
+        StatsColumns: One list per column. (Список значений для каждого столбца)
+    """
+    columns = tuple(zip(*rows)) or ((),) * len(STATS_COLUMNS)
+    return {name: list(values) for name, values in zip(STATS_COLUMNS, columns)}
+
+def _format_top_entry(r: Dict[str, Any]) -> Tuple[Any, str, str]:
+    """
+    Converts a top-searches group result into a display row.
+    (Преобразует результат группировки топ-запросов в строку для отображения.)
+    """
+    etype = r["_id"]["type"]
+    count = r["count"]
+    if etype == "search_by_keyword":
+        keyword = r["_id"].get("keyword", "—")
+        event_type = "поиск по слову"
+        params = f"'{keyword}' — {count} раз"
+    else:
+        genre = r["_id"].get("genre", "—")
+        y1 = r["_id"].get("year_from", "—")
+        y2 = r["_id"].get("year_to", "—")
+        event_type = "поиск по жанру"
+        params = f"{genre}, {y1}-{y2} — {count} раз"
+    return r["timestamp"], event_type, params
+
+def _format_recent_entry(r: Dict[str, Any]) -> Tuple[Any, str, str]:
+    """
+    Converts a recent-unique group result into a display row.
+    (Преобразует результат группировки уникальных запросов в строку для отображения.)
+    """
+    return r["timestamp"], "уникальный запрос", f"'{r['_id']}'"
+
+def get_top_searches(logger: Optional[MongoLogger] = None) -> StatsColumns:
     """
     Returns the top 5 most frequent search queries (by keyword or genre).
     (Возвращает топ-5 самых частых запросов (по ключевому слову и жанру).)
@@ -21,64 +220,26 @@ def get_top_searches(logger: Optional[MongoLogger] = None) -> List[Dict[str, Any
             (Экземпляр логгера MongoDB, может быть None.)
 
     Returns:
-        List[Dict[str, Any]]: List of formatted search statistics for display.
-            (Список словарей с форматированной статистикой для отображения.)
+        StatsColumns: Formatted search statistics for display, by column.
+            (Форматированная статистика для отображения, по столбцам.)
     """
     if not logger or not logger.is_connected():
         return unavailable_stats("MongoDB")
+    cached = _cache_get("top", logger)
+    if cached is not None:
+        return cached
     try:
-        pipeline = [
-            {"$match": {"event_type": {"$in": ["search_by_keyword", "search_by_genre_year"]}}},
-            {"$sort": {"timestamp": -1}},
-            {"$group": {
-                "_id": {
-                    "type": "$event_type",
-                    "keyword": "$data.keyword",
-                    "genre": "$data.genre",
-                    "year_from": "$data.year_from",
-                    "year_to": "$data.year_to"
-                },
-                "count": {"$sum": 1},
-                "timestamp": {"$first": "$timestamp"}
-            }},
-            {"$sort": {"count": -1}},
-            {"$limit": 5}
-        ]
-
-        result = list(logger.collection.aggregate(pipeline))
-        formatted: List[Dict[str, Any]] = []
-        for r in result:
-            etype = r["_id"]["type"]
-            timestamp = r["timestamp"]
-            count = r["count"]
-            if etype == "search_by_keyword":
-                keyword = r["_id"].get("keyword", "—")
-                event_type = "поиск по слову"
-                params = f"'{keyword}' — {count} раз"
-            else:
-                genre = r["_id"].get("genre", "—")
-                y1 = r["_id"].get("year_from", "—")
-                y2 = r["_id"].get("year_to", "—")
-                event_type = "поиск по жанру"
-                params = f"{genre}, {y1}-{y2} — {count} раз"
-            formatted.append({
-                "timestamp": timestamp,
-                "event_type": event_type,
-                "params": params
-            })
-        logger.log_event(
-            "stats_top_searches",
-            {
-                "returned": len(formatted),
-                "description": f"Топ-5 самых частых запросов (всего: {len(formatted)})"
-            },
-            level="debug"
-        )
+        # Make just-logged searches visible to the aggregation
+        # (Чтобы только что записанные поиски попали в агрегацию)
+        logger.flush()
+        formatted = _rows_to_columns(map(_format_top_entry, _aggregate(logger, _TOP_PIPELINE)))
+        _log.debug("stats_top_searches: returned %d", len(formatted["timestamp"]))
+        _cache_put("top", formatted, logger)
         return formatted
     except Exception as e:
         return log_stats_error(logger, "top_searches", str(e))
 
-def get_recent_unique_searches(logger: Optional[MongoLogger] = None) -> List[Dict[str, Any]]:
+def get_recent_unique_searches(logger: Optional[MongoLogger] = None) -> StatsColumns:
     """
     Returns the 5 most recent unique keyword searches.
     (Возвращает 5 последних уникальных поисковых ключевых слов.)
@@ -88,42 +249,64 @@ def get_recent_unique_searches(logger: Optional[MongoLogger] = None) -> List[Dic
             (Экземпляр логгера MongoDB, может быть None.)
 
     Returns:
-        List[Dict[str, Any]]: List of recent unique keyword search stats.
-            (Список последних уникальных поисковых запросов.)
+        StatsColumns: Recent unique keyword search stats, by column.
+            (Последние уникальные поисковые запросы, по столбцам.)
     """
     if not logger or not logger.is_connected():
         return unavailable_stats("MongoDB")
+    cached = _cache_get("recent", logger)
+    if cached is not None:
+        return cached
     try:
-        pipeline = [
-            {"$match": {"event_type": "search_by_keyword"}},
-            {"$sort": {"timestamp": -1}},
-            {"$group": {
-                "_id": "$data.keyword",
-                "timestamp": {"$first": "$timestamp"}
-            }},
-            {"$sort": {"timestamp": -1}},
-            {"$limit": 5}
-        ]
-        result = list(logger.collection.aggregate(pipeline))
-        logger.log_event(
-            "stats_recent_unique",
-            {
-                "returned": len(result),
-                "description": f"Последние 5 уникальных запросов — {len(result)} результатов"
-            },
-            level="debug"
-        )
-        return [
-            {
-                "timestamp": r["timestamp"],
-                "event_type": "уникальный запрос",
-                "params": f"'{r['_id']}'"
-            } for r in result
-        ]
+        logger.flush()
+        formatted = _rows_to_columns(map(_format_recent_entry, _aggregate(logger, _RECENT_PIPELINE)))
+        _log.debug("stats_recent_unique: returned %d", len(formatted["timestamp"]))
+        _cache_put("recent", formatted, logger)
+        return formatted
     except Exception as e:
         return log_stats_error(logger, "recent_unique", str(e))
 
-def unavailable_stats(source: str) -> List[Dict[str, Any]]:
+def get_search_dashboard(logger: Optional[MongoLogger] = None) -> Dict[str, StatsColumns]:
+    """
+    Returns top searches and recent unique searches in a single aggregation
+    using $facet, scanning the search events only once.
+    (Возвращает топ-запросы и последние уникальные запросы за один запрос
+    агрегации через $facet, просматривая события поиска один раз.)
+
+    Args:
+        logger (Optional[MongoLogger]): MongoDB logger instance.
+            (Экземпляр логгера MongoDB, может быть None.)
+
+    Returns:
+        Dict[str, StatsColumns]:
+            {"top": ..., "recent": ...} with columns formatted for display.
+            ({"top": ..., "recent": ...} — столбцы для отображения.)
+    """
+    if not logger or not logger.is_connected():
+        stub = unavailable_stats("MongoDB")
+        return {"top": stub, "recent": stub}
+    cached = _cache_get("dashboard", logger)
+    if cached is not None:
+        return cached
+    try:
+        logger.flush()
+        facets = next(_aggregate(logger, _DASHBOARD_PIPELINE, batch_size=1), {})
+        dashboard = {
+            "top": _rows_to_columns(map(_format_top_entry, facets.get("top", []))),
+            "recent": _rows_to_columns(map(_format_recent_entry, facets.get("recent", [])))
+        }
+        _log.debug(
+            "stats_dashboard: returned %d top, %d recent",
+            len(dashboard["top"]["timestamp"]),
+            len(dashboard["recent"]["timestamp"])
+        )
+        _cache_put("dashboard", dashboard, logger)
+        return dashboard
+    except Exception as e:
+        error = log_stats_error(logger, "dashboard", str(e))
+        return {"top": error, "recent": error}
+
+def unavailable_stats(source: str) -> StatsColumns:
     """
     Returns placeholder if MongoDB or logger is unavailable.
     (Возвращает заглушку, если MongoDB или логгер недоступны.)
@@ -134,18 +317,14 @@ def unavailable_stats(source: str) -> List[Dict[str, Any]]:
             (Имя недоступного компонента, например, "MongoDB".)
 
     Returns:
-        List[Dict[str, Any]]:
-            List with a single stub entry for UI display.
-            (Список с одной заглушкой для отображения в интерфейсе.)
+        StatsColumns:
+            Columns with a single stub entry for UI display.
+            (Столбцы с одной заглушкой для отображения в интерфейсе.)
     """
 
-    return [{
-        "timestamp": "—",
-        "event_type": source,
-        "params": "недоступна"
-    }]
+    return _rows_to_columns([("—", source, "недоступна")])
 
-def log_stats_error(logger: Optional[MongoLogger], context: str, error: str) -> List[Dict[str, Any]]:
+def log_stats_error(logger: Optional[MongoLogger], context: str, error: str) -> StatsColumns:
     """
     Logs error retrieving statistics.
     (Логирует ошибку получения статистики.)
@@ -162,8 +341,8 @@ def log_stats_error(logger: Optional[MongoLogger], context: str, error: str) ->
             (Сообщение исключения для логирования.)
 
     Returns:
-        List[Dict[str, Any]]:
-            Formatted error entry for UI display.
+        StatsColumns:
+            Formatted error entry for UI display, by column.
             (Форматированная запись об ошибке для отображения в интерфейсе.)
     """
 
@@ -177,8 +356,4 @@ def log_stats_error(logger: Optional[MongoLogger], context: str, error: str) ->
             },
             level="error"
         )
-    return [{
-        "timestamp": "—",
-        "event_type": "ошибка",
-        "params": f"ошибка при получении статистики ({context})"
-    }]
\ No newline at end of file
+    return _rows_to_columns([("—", "ошибка", f"ошибка при получении статистики ({context})")])
\ No newline at end of file
@@ -9,11 +9,68 @@ key log entries to the console.
 """
 
 from pymongo import MongoClient
+from bson.datetime_ms import DatetimeMS
 from datetime import datetime, timezone
-from typing import Callable, Optional
-from functools import wraps
+from typing import Callable, Optional, List
+from functools import wraps, lru_cache
+import logging
+import queue
+import sys
+import threading
+import time
 import config
 
+# === Constants: background log writer ===
+LOG_QUEUE_SIZE: int = 10_000      # Максимальный размер очереди логов
+LOG_BATCH_SIZE: int = 500         # Максимальное число записей в одной пачке
+LOG_FLUSH_INTERVAL: float = 0.1   # Интервал сброса пачки в MongoDB (сек.)
+
+# === Constants: log levels and trace size ===
+_LEVELS = {  # Числовые уровни логов (совпадают с модулем logging)
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR
+}
+TRACE_MAX_LEN: int = 200  # Максимальная длина строковых полей трассировки
+
+# === Constant: index backing statistics queries ===
+STATS_INDEX = [("event_type", 1), ("timestamp", -1)]  # Индекс для $match/$sort статистики
+
+# === Constants: console output ===
+CONSOLE_FORMAT: str = "[%(levelname)s] %(asctime)s  %(message)s"  # Формат строки в консоли
+CONSOLE_DATEFMT: str = "%Y-%m-%d %H:%M:%S"                         # Формат времени в консоли
+
+def _console_handler() -> logging.Handler:
+    """
+    Creates the stdout handler for console log lines.
+    (Создаёт обработчик вывода строк лога в консоль.)
+
+    Returns:
+        logging.Handler: Stream handler with UTC timestamps.
+            (Обработчик потока с временем в UTC.)
+    """
+    formatter = logging.Formatter(CONSOLE_FORMAT, datefmt=CONSOLE_DATEFMT)
+    formatter.converter = time.gmtime
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(formatter)
+    return handler
+
+@lru_cache(maxsize=1)
+def get_client(uri: Optional[str] = None) -> MongoClient:
+    """
+    Returns the process-wide MongoDB client (one connection pool per process).
+    (Возвращает общий для процесса клиент MongoDB — один пул соединений.)
+
+    Args:
+        uri (Optional[str]): MongoDB connection URI, defaults to config.MONGO_URI.
+                             (URI подключения к MongoDB, по умолчанию config.MONGO_URI.)
+
+    Returns:
+        MongoClient: Shared MongoDB client. (Общий клиент MongoDB)
+    """
+    return MongoClient(uri or config.MONGO_URI, maxPoolSize=50, serverSelectionTimeoutMS=3000)
+
 class MongoLogger:
     """
     Logger for recording events into MongoDB and printing important logs
@@ -40,18 +97,49 @@ class MongoLogger:
             uri (Optional[str]): MongoDB connection URI.
                                  (URI подключения к MongoDB.)
         """
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self._connected: bool = False
+        self._closed: bool = False
+        self.events_logged: int = 0  # Число записей, поставленных в очередь
+        self.stats_index: Optional[str] = None  # Имя индекса статистики, если он создан
+        self.min_level: int = _LEVELS.get(str(config.LOG_LEVEL).lower(), _LEVELS["info"])
+
+        # Console lines are written on the caller's thread, in order with the
+        # prompts; only MongoDB writes go through the background queue
+        # (Строки в консоль пишутся в вызывающем потоке, по порядку с запросами
+        # ввода; через фоновую очередь идёт только запись в MongoDB)
+        self._console_handler = _console_handler()
+        self._console = logging.getLogger("mongologger")
+        self._console.setLevel(logging.DEBUG)
+        self._console.propagate = False
+        self._console.addHandler(self._console_handler)
+
         try:
             self.uri: str = uri or config.MONGO_URI
             self.db_name: str = db_name or config.MONGO_DB_NAME or "movie_search_logs"
             self.collection_name: str = collection_name or config.MONGO_COLLECTION or "logs"
 
-            self.client: MongoClient = MongoClient(self.uri, serverSelectionTimeoutMS=3000)
+            self.client: MongoClient = get_client(self.uri)
             self.db = self.client[self.db_name]
             self.collection = self.db[self.collection_name]
 
             # Test MongoDB connection (Проверка соединения с сервером MongoDB)
             self.client.server_info()
 
+            # Index backing the $match/$sort prefix of statistics pipelines;
+            # logging works without it (Индекс для $match/$sort в агрегациях
+            # статистики; логирование работает и без него)
+            try:
+                self.stats_index = self.collection.create_index(STATS_INDEX)
+            except Exception as e:
+                self._console.warning("MongoDB: statistics index not created → %s", e)
+
+            # Start background writer (Запуск фонового потока записи логов)
+            self._worker = threading.Thread(target=self._drain, daemon=True)
+            self._worker.start()
+            self._connected = True
+
             # Log success connection (Лог успешного подключения)
             self.log_event(
                 "mongodb_connected",
@@ -59,8 +147,9 @@ class MongoLogger:
                 level="info"
             )
         except Exception as e:
-            print(f"[ERROR] MongoDB: connection error → {e}")
+            self._console.error("MongoDB: connection error → %s", e)
             self.collection = None
+            self._connected = False
 
     def is_connected(self) -> bool:
         """
@@ -72,7 +161,7 @@ class MongoLogger:
         True if the MongoDB connection is active, otherwise False.
         (True — если соединение с MongoDB установлено, иначе False.)
         """
-        return self.collection is not None
+        return self._connected
 
     def get_timestamp(self) -> datetime:
         """
@@ -96,24 +185,27 @@ class MongoLogger:
             data (dict): Event data. (Данные события)
             level (str): Log level. (Уровень лога)
         """
-        if not self.is_connected():
+        if not self._connected:
             return
 
-        timestamp = self.get_timestamp()
+        # Stored as a BSON Date built straight from epoch milliseconds
+        # (Сохраняется как BSON Date напрямую из миллисекунд эпохи)
         entry = {
             "event_type": event_type,
             "data": data,
             "level": level,
-            "timestamp": timestamp
+            "timestamp": DatetimeMS(time.time_ns() // 1_000_000)
         }
         try:
-            self.collection.insert_one(entry)
-        except Exception as e:
-            print(f"[ERROR] MongoLogger: failed to write to MongoDB → {e}")
+            self._queue.put_nowait(entry)
+            self.events_logged += 1
+        except queue.Full:
+            # Drop the entry rather than block the caller
+            # (Запись отбрасывается, чтобы не блокировать вызывающий код)
+            pass
 
         # Console output for certain levels (Вывод в консоль для info и error)
         if level in {"info", "error"}:
-            time_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
             source_map = {
                 "startup": "MongoLogger",
                 "db_connected": "MySQL",
@@ -123,7 +215,66 @@ class MongoLogger:
             }
             source = source_map.get(event_type, event_type)
             description = data.get("description") or str(data)
-            print(f"[{level.upper()}] {time_str}  {source}: {description}")
+            self._console.log(_LEVELS[level], "%s: %s", source, description)
+
+    def _drain(self) -> None:
+        """
+        Background loop that collects queued entries into batches and writes
+        them to MongoDB with insert_many.
+        (Фоновый цикл: собирает записи из очереди в пачки и записывает
+        их в MongoDB через insert_many.)
+
+        A None entry in the queue stops the loop after the current batch.
+        (Значение None в очереди завершает цикл после текущей пачки.)
+        """
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                self._queue.task_done()
+                return
+            batch: List[dict] = [entry]
+            stop = False
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            while len(batch) < LOG_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._write_batch(batch)
+            # Mark written entries (and the stop marker) as processed for flush()
+            # (Отмечаем записанные элементы и маркер остановки как обработанные для flush())
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[dict]) -> None:
+        """
+        Writes a batch of log entries to MongoDB.
+        (Записывает пачку лог-записей в MongoDB.)
+
+        Args:
+            batch (List[dict]): Log entries to insert. (Записи для вставки)
+        """
+        try:
+            self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            self._console.error("MongoLogger: failed to write to MongoDB → %s", e)
+
+    def flush(self) -> None:
+        """
+        Blocks until every queued log entry has been written to MongoDB.
+        (Блокирует выполнение, пока все записи из очереди не будут записаны в MongoDB.)
+        """
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.join()
 
     def log_input_error(self, context: str, user_input: str) -> None:
         """
@@ -134,7 +285,7 @@ class MongoLogger:
             context (str): Context of the input. (Контекст ошибки)
             user_input (str): Invalid user input. (Ошибочный ввод)
         """
-        print(f"[Input Error] Context: {context} | Input: {user_input}")
+        self._console.warning("Input Error | Context: %s | Input: %s", context, user_input)
         self.log_event(
             "input_error",
             {
@@ -167,14 +318,18 @@ class MongoLogger:
             @wraps(func)
             def wrapper(*args, **kwargs):
                 result = func(*args, **kwargs)
+                # Skip serialization when the level is filtered out
+                # (Пропуск сериализации, если уровень ниже порога)
+                if _LEVELS.get(level, 0) < self.min_level:
+                    return result
                 self.log_event(
                     "action_trace",
                     {
                         "action": action_name,
                         "function": func.__name__,
-                        "args": str(args),
-                        "kwargs": str(kwargs),
-                        "result": str(result)
+                        "args": str(args)[:TRACE_MAX_LEN],
+                        "kwargs": str(kwargs)[:TRACE_MAX_LEN],
+                        "result": str(result)[:TRACE_MAX_LEN]
                     },
                     level=level
                 )
@@ -184,11 +339,26 @@ class MongoLogger:
 
     def close(self) -> None:
         """
-        Closes MongoDB client connection gracefully.
-        (Закрывает соединение с MongoDB.)
+        Flushes queued log entries and closes MongoDB client connection gracefully.
+        Safe to call more than once; later calls do nothing, and events logged
+        after closing are ignored.
+        (Записывает оставшиеся логи из очереди и закрывает соединение с MongoDB.
+        Повторные вызовы ничего не делают, а события после закрытия игнорируются.)
         """
+        if self._closed:
+            return
+        self._closed = True
+        # Stop accepting entries before the worker is told to stop
+        # (Прекращаем приём записей до остановки фонового потока)
+        self._connected = False
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=5)
         if hasattr(self, 'client') and self.client:
             try:
                 self.client.close()
+                get_client.cache_clear()
             except Exception:
-                print("[WARNING] MongoLogger: failed to close MongoDB connection.")
\ No newline at end of file
+                self._console.warning("MongoLogger: failed to close MongoDB connection.")
+
+        self._console.removeHandler(self._console_handler)
\ No newline at end of file
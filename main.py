@@ -13,33 +13,87 @@ import mysql_connector
 import user_interface as ui
 import formatter
 from log_writer import MongoLogger
-from log_stats import get_top_searches, get_recent_unique_searches
-from typing import Callable, Any
+from typing import Callable, Any, Tuple, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, Future
+import atexit
+import threading
 
-def log_keyword_summary(keyword: str, found_count: int, logger: MongoLogger) -> None:
+# Single background worker that fetches the next page while the user reads
+# the current one (Фоновый поток: загружает следующую страницу, пока
+# пользователь читает текущую)
+_PREFETCH = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+
+# The prefetch worker shares the main MySQL connection, which is not
+# thread-safe: every query made while a prefetch may run holds this lock
+# (Фоновый поток использует то же соединение MySQL, которое не потокобезопасно:
+# каждый запрос, пока может идти предзагрузка, выполняется под этой блокировкой)
+_CONN_LOCK = threading.Lock()
+
+def _with_connection(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
     """
-    Logs the summary of a keyword search event.
-    (Логирует результат поиска по ключевому слову.)
+    Calls a query function while holding the shared connection lock.
+    (Вызывает функцию запроса, удерживая блокировку общего соединения.)
 
     Args:
-        keyword (str): Search keyword. (Ключевое слово для поиска)
-        found_count (int): Number of results found. (Количество найденных результатов)
+        func (Callable[..., Any]): Query function. (Функция запроса)
+        *args (Any): Positional arguments. (Позиционные аргументы)
+        **kwargs (Any): Keyword arguments. (Именованные аргументы)
+
+    Returns:
+        Any: Result of the call. (Результат вызова)
+    """
+    with _CONN_LOCK:
+        return func(*args, **kwargs)
+
+def log_search_page(
+    event_type: str,
+    params: Dict[str, Any],
+    found_count: int,
+    after: Optional[mysql_connector.PageKey],
+    logger: MongoLogger
+) -> None:
+    """
+    Logs a single structured event for one page of search results.
+    The first page is logged as the search itself (used by statistics),
+    further pages as "search_page" at debug level.
+    (Логирует одно структурированное событие на страницу результатов.
+    Первая страница записывается как сам поиск (используется статистикой),
+    последующие — как "search_page" на уровне debug.)
+
+    Args:
+        event_type (str): Search event name, e.g. "search_by_keyword".
+                          (Название события поиска, например "search_by_keyword")
+        params (Dict[str, Any]): Search parameters. (Параметры поиска)
+        found_count (int): Number of results on the page. (Количество результатов на странице)
+        after (Optional[PageKey]): Page key, None for the first page.
+                                   (Ключ страницы, None для первой страницы)
         logger (MongoLogger): Logger instance. (Экземпляр логгера)
     """
-    status = "found" if found_count > 0 else "not_found"
-    logger.log_event(
-        "keyword_summary",
-        {
-            "keyword": keyword,
-            "status": status,
-            "found_count": found_count
-        },
-        level="info"
-    )
+    if after is None:
+        status = "found" if found_count > 0 else "not_found"
+        summary = ", ".join(f"{k}: {v}" for k, v in params.items())
+        logger.log_event(
+            event_type,
+            {
+                **params,
+                "status": status,
+                "found_count": found_count,
+                "description": f"Поиск ({summary}) → найдено {found_count}"
+            },
+            level="info"
+        )
+    else:
+        logger.log_event(
+            "search_page",
+            {"search": event_type, **params, "after": after, "found_count": found_count},
+            level="debug"
+        )
 
 def show_paginated_results(
-    search_func: Callable[..., list],
+    search_func: Callable[..., Tuple[list, bool]],
     *args: Any,
+    event_type: str,
+    params: Dict[str, Any],
     logger: MongoLogger
 ) -> None:
     """
@@ -47,33 +101,61 @@ def show_paginated_results(
     (Отображает результаты поиска постранично, обрабатывает запросы на продолжение.)
 
     Args:
-        search_func (Callable[..., list]): Search function. (Функция поиска)
+        search_func (Callable[..., Tuple[list, bool]]): Search function returning
+            a page of results and a has-next flag.
+            (Функция поиска, возвращающая страницу результатов и признак следующей страницы)
         *args (Any): Arguments to pass to search function. (Аргументы для функции поиска)
+        event_type (str): Search event name for logging. (Название события поиска для лога)
+        params (Dict[str, Any]): Search parameters for logging. (Параметры поиска для лога)
         logger (MongoLogger): Logger instance. (Экземпляр логгера)
+
+    The next page is queried in the background, on the same connection,
+    while the user answers the "show more" prompt. Queries from both threads
+    go through _with_connection, so they never overlap; the pending page is
+    also awaited before returning, leaving the connection idle for the caller.
+    (Следующая страница запрашивается в фоне через то же соединение, пока
+    пользователь отвечает на вопрос «Показать ещё?». Запросы обоих потоков
+    идут через _with_connection и не пересекаются; перед выходом фоновая
+    страница дожидается, и соединение свободно для вызывающего кода.)
     """
-    offset = 0
-    while True:
-        results = search_func(*args, offset=offset, logger=logger)
+    # Only a keyword search can be retried with a new keyword
+    # (Повторить с новым ключевым словом можно только поиск по ключевому слову)
+    is_keyword = search_func is mysql_connector.search_by_keyword
+    mysql_conn = args[0]
+    after = None
+    pending: Optional[Future] = None
+    try:
+        while True:
+            if pending is not None:
+                results, has_next = pending.result()
+                pending = None
+            else:
+                results, has_next = _with_connection(search_func, *args, after=after, logger=logger)
+            log_search_page(event_type, params, len(results), after, logger)
 
-        # Log only the first page for keyword search (Лог только при первой странице для ключевого слова)
-        if offset == 0 and search_func.__name__ == "search_by_keyword":
-            keyword = args[1] if len(args) > 1 else ""
-            log_keyword_summary(keyword, len(results), logger)
+            if not results:
+                ui.print_message("По вашему запросу ничего не найдено.")
+                if not is_keyword or not ui.continue_or_menu_prompt(logger):
+                    break
+                new_keyword = ui.get_keyword_input(logger)
+                after = None
+                args = (mysql_conn, new_keyword)
+                params = {"keyword": new_keyword}
+                continue
 
-        ui.show_results(results)
+            ui.show_results(results)
 
-        if not results:
-            ui.print_message("По вашему запросу ничего не найдено.")
-            if not ui.continue_or_menu_prompt(logger):
+            if not has_next:
                 break
-            new_keyword = ui.get_keyword_input(logger)
-            offset = 0
-            args = (args[0], new_keyword)
-            continue
-
-        if len(results) < 10 or not ui.continue_prompt(logger):
-            break
-        offset += 10
+            # Next page starts after the last shown film (Следующая страница — после последнего фильма)
+            after = mysql_connector.page_key(results[-1])
+            pending = _PREFETCH.submit(_with_connection, search_func, *args, after=after, logger=logger)
+            if not ui.continue_prompt(logger):
+                break
+    finally:
+        # Leave the connection idle before returning (Освобождаем соединение перед выходом)
+        if pending is not None and not pending.cancel():
+            pending.result()
 
 def main() -> None:
     """
@@ -86,6 +168,11 @@ def main() -> None:
     запускает главный цикл меню и обеспечивает корректное завершение работы.)
     """
     logger = MongoLogger()
+    # Queued log entries are written on every exit path, including early
+    # returns, EOF on input and uncaught errors
+    # (Записи из очереди сохраняются при любом выходе: досрочный return,
+    # конец ввода, необработанные ошибки)
+    atexit.register(logger.close)
     logger.log_event("startup", {"description": "MongoLogger успешно инициализирован."}, level="info")
 
     try:
@@ -96,7 +183,7 @@ def main() -> None:
             level="info"
         )
     except Exception as e:
-        ui.show_error("Ошибка подключения к базе данных. Попробуйте позже.", logger=logger)
+        ui.show_error("Ошибка подключения к базе данных. Попробуйте позже.")
         logger.log_event(
             "db_connection_error",
             {"description": "Ошибка подключения к MySQL", "error": str(e)},
@@ -104,6 +191,18 @@ def main() -> None:
         )
         return
 
+    # Indexes only speed searches up: a failure is logged and the app goes on
+    # (Индексы лишь ускоряют поиск: ошибка логируется, работа продолжается)
+    try:
+        mysql_connector.ensure_fulltext_index(mysql_conn, logger=logger)
+        mysql_connector.ensure_search_indexes(mysql_conn, logger=logger)
+    except Exception as e:
+        logger.log_event(
+            "search_index_unavailable",
+            {"description": "Не удалось подготовить индексы поиска", "error": str(e)},
+            level="warning"
+        )
+
     ui.print_separator()
     ui.print_message("Добро пожаловать в Movie Search! Найдём кино под настроение")
     ui.print_separator()
@@ -114,32 +213,37 @@ def main() -> None:
         if choice == 1:
             # Keyword search (Поиск по ключевому слову)
             keyword = ui.get_keyword_input(logger)
-            logger.log_event("search_by_keyword", {"keyword": keyword}, level="info")
-            show_paginated_results(mysql_connector.search_by_keyword, mysql_conn, keyword, logger=logger)
+            show_paginated_results(
+                mysql_connector.search_by_keyword,
+                mysql_conn,
+                keyword,
+                event_type="search_by_keyword",
+                params={"keyword": keyword},
+                logger=logger
+            )
 
         elif choice == 2:
             # Genre + year range search (Поиск по жанру и годам)
             genres, min_year, max_year = mysql_connector.get_genre_and_years(mysql_conn, logger=logger)
-            genre, year_from, year_to = ui.genre_year_input(genres, min_year, max_year, logger=logger)
+            genre, year_from, year_to = ui.genre_year_input(list(genres), min_year, max_year, logger=logger)
             if genre is None:
                 continue
-            logger.log_event(
-                "search_by_genre_year",
-                {"genre": genre, "year_from": year_from, "year_to": year_to},
-                level="info"
-            )
             show_paginated_results(
                 mysql_connector.search_by_genre_and_year,
                 mysql_conn,
-                genre,
+                genres[genre],
                 year_from,
                 year_to,
+                event_type="search_by_genre_year",
+                params={"genre": genre, "year_from": year_from, "year_to": year_to},
                 logger=logger
             )
 
         elif choice == 3:
             # View statistics (Просмотр статистики)
-            ui.print_statistics_menu()
+            # Imported on first use: statistics are optional for a session
+            # (Импорт при первом использовании: статистика нужна не в каждом сеансе)
+            from log_stats import get_top_searches, get_recent_unique_searches
             stat_choice = ui.get_statistics_choice(logger)
             results = (
                 get_top_searches(logger=logger)
@@ -158,6 +262,9 @@ def main() -> None:
             )
             break
 
+    # Normal exit only: after Ctrl+C the OS closes the socket
+    # (Только при обычном выходе: после Ctrl+C сокет закроет ОС)
+    mysql_connector.close_connection(mysql_conn)
     logger.close()
 
 if __name__ == "__main__":
@@ -10,28 +10,92 @@ and searching films by keyword or by genre and year range.
 а также поиска фильмов по ключевым словам или по жанру и году выпуска.)
 """
 
-from typing import List, Tuple, Dict, Optional, TypedDict
+from typing import List, Tuple, Dict, Optional, NamedTuple, Any
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+import time
 import mysql.connector
 from mysql.connector.connection import MySQLConnection
+from mysql.connector.cursor import MySQLCursorPrepared
 from mysql.connector import Error as MySQLError
 from log_writer import MongoLogger
 
+# === Constants: connection options ===
+CONNECTION_OPTIONS: Dict[str, bool] = {
+    "use_pure": False,  # Протокол через C-расширение
+    "compress": True    # Сжатие протокола для текстовых результатов
+}
+
 # === Constant: pagination size ===
 DEFAULT_LIMIT: int = 10  # Количество фильмов на страницу
 
-class FilmRecord(TypedDict):
+# Keyset cursor: (release_year, film_id) of the last row on the previous page;
+# the year may be None for films without one
+# (Ключ страницы: (release_year, film_id) последней строки предыдущей страницы;
+# год может быть None у фильмов без года)
+PageKey = Tuple[Optional[int], int]
+
+# === Constant: metadata cache lifetime ===
+METADATA_TTL: float = 300.0  # Время жизни кэша жанров и годов (сек.)
+
+# Cached genres/years per connection: id(conn) -> (expires_at, value)
+# (Кэш жанров и годов для соединения: id(conn) -> (срок, значение))
+_META_CACHE: Dict[int, Tuple[float, Tuple[Dict[str, int], int, int]]] = {}
+
+# === Constants: search result cache ===
+RESULT_CACHE_SIZE: int = 256     # Максимальное число закэшированных страниц
+RESULT_CACHE_TTL: float = 60.0   # Время жизни страницы в кэше (сек.)
+
+class FilmRecord(NamedTuple):
     """
     Structure of a film record returned from search queries.
-    (Структура записи фильма, возвращаемой функциями поиска.)
+    Field order matches the SELECT column order of the search queries.
+    (Структура записи фильма, возвращаемой функциями поиска.
+    Порядок полей совпадает с порядком столбцов в SELECT.)
     """
-    title: str                # Название фильма
-    release_year: int         # Год выпуска
-    rating: Optional[str]     # Рейтинг (может быть None)
+    film_id: int                 # Идентификатор фильма
+    title: str                   # Название фильма
+    release_year: Optional[int]  # Год выпуска (может быть None)
+    rating: Optional[str]        # Рейтинг (может быть None)
+
+# Prepared cursors per connection, one per SQL text
+# (Подготовленные курсоры для каждого соединения, по одному на текст запроса)
+_PREPARED: "WeakKeyDictionary[MySQLConnection, Dict[str, MySQLCursorPrepared]]" = WeakKeyDictionary()
+
+# === FULLTEXT keyword search ===
+FULLTEXT_INDEX: str = "ft_film"  # Имя полнотекстового индекса по (title, description)
+
+# Connections where the FULLTEXT index is available (Соединения с доступным FULLTEXT-индексом)
+_FULLTEXT: "WeakKeyDictionary[MySQLConnection, bool]" = WeakKeyDictionary()
+
+# === Search indexes: (table, index name, leading columns) ===
+# film_category(category_id) is already covered by sakila's foreign key index
+# (film_category(category_id) уже покрыт индексом внешнего ключа в sakila)
+SEARCH_INDEXES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("film", "idx_film_year_id", ("release_year", "film_id")),  # Сортировка и ключ страницы
+)
+
+# Boolean-mode operators removed from user input (Операторы BOOLEAN MODE, удаляемые из ввода)
+_FULLTEXT_OPERATORS = str.maketrans({c: " " for c in '+-<>()~*"@'})
+
+# Cached search pages: (id(conn), search, *params, after) -> (expires_at, (rows, has_next))
+# (Кэш страниц поиска: (id(conn), поиск, *параметры, ключ) -> (срок, (строки, есть_ещё)))
+_RESULT_CACHE: "OrderedDict[tuple, Tuple[float, Tuple[List[FilmRecord], bool]]]" = OrderedDict()
+
+# Total matches per search, same size/TTL limits as pages:
+# (id(conn), search, *params) -> (expires_at, count)
+# (Общее число совпадений с теми же ограничениями, что и у страниц:
+# (id(conn), поиск, *параметры) -> (срок, количество))
+_COUNT_CACHE: "OrderedDict[tuple, Tuple[float, int]]" = OrderedDict()
 
 def connection(config: dict, logger: Optional[MongoLogger] = None) -> MySQLConnection:
     """
-    Establishes a connection to the MySQL database.
-    (Устанавливает соединение с базой данных MySQL.)
+    Establishes a connection to the MySQL database. The connection uses the
+    C extension with protocol compression, falling back to the pure Python
+    implementation if the extension is not installed.
+    (Устанавливает соединение с базой данных MySQL. Используется C-расширение
+    со сжатием протокола; если расширение не установлено — реализация на
+    чистом Python.)
 
     Args:
         config (dict): Connection parameters. (Параметры подключения.)
@@ -40,8 +104,22 @@ def connection(config: dict, logger: Optional[MongoLogger] = None) -> MySQLConne
     Returns:
         MySQLConnection: Active connection object. (Активное соединение с базой данных)
     """
+    options = {**config, **CONNECTION_OPTIONS}
     try:
-        return mysql.connector.connect(**config)
+        try:
+            return mysql.connector.connect(**options)
+        except ImportError as e:
+            if logger:
+                logger.log_event(
+                    "mysql_cext_unavailable",
+                    {
+                        "description": "C-расширение MySQL недоступно, используется реализация на Python",
+                        "error": str(e)
+                    },
+                    level="warning"
+                )
+            options["use_pure"] = True
+            return mysql.connector.connect(**options)
     except MySQLError as err:
         if logger:
             logger.log_event(
@@ -59,13 +137,148 @@ def connection(config: dict, logger: Optional[MongoLogger] = None) -> MySQLConne
             )
         raise
 
+def close_connection(mysql_conn: MySQLConnection) -> None:
+    """
+    Closes the MySQL connection and clears the search caches tied to it.
+    (Закрывает соединение с MySQL и очищает связанный с ним кэш поиска.)
+
+    Args:
+        mysql_conn (MySQLConnection): Connection returned by connection().
+            (Соединение, полученное из connection().)
+    """
+    try:
+        mysql_conn.close()
+    except MySQLError:
+        pass
+    finally:
+        # Cached pages and totals are keyed by id(conn), which may be reused
+        # (Кэш страниц и итогов привязан к id(conn), который может повториться)
+        invalidate_result_cache()
+
+def ensure_fulltext_index(
+    mysql_conn: MySQLConnection,
+    logger: Optional[MongoLogger] = None
+) -> bool:
+    """
+    Makes sure the FULLTEXT index on film(title, description) exists, creating
+    it once if needed. Keyword search falls back to LIKE when this fails
+    (e.g. for a read-only user).
+    (Проверяет наличие FULLTEXT-индекса по film(title, description) и при
+    необходимости создаёт его. Если это не удалось — например, у пользователя
+    нет прав на изменение, — поиск по ключевому слову использует LIKE.)
+
+    Args:
+        mysql_conn (MySQLConnection): Active MySQL connection. (Активное соединение)
+        logger (Optional[MongoLogger]): Logger instance. (Экземпляр логгера)
+
+    Returns:
+        bool: True if FULLTEXT search is available. (True, если доступен FULLTEXT-поиск)
+    """
+    try:
+        with mysql_conn.cursor() as cursor:
+            cursor.execute("SHOW INDEX FROM film WHERE Key_name = %s", (FULLTEXT_INDEX,))
+            exists = bool(cursor.fetchall())
+            if not exists:
+                cursor.execute(
+                    f"ALTER TABLE film ADD FULLTEXT INDEX {FULLTEXT_INDEX} (title, description)"
+                )
+        _FULLTEXT[mysql_conn] = True
+    except Exception as e:
+        _FULLTEXT[mysql_conn] = False
+        if logger:
+            logger.log_event(
+                "fulltext_unavailable",
+                {
+                    "description": "FULLTEXT-индекс недоступен, поиск по ключу использует LIKE",
+                    "error": str(e)
+                },
+                level="warning"
+            )
+    return _FULLTEXT[mysql_conn]
+
+def _has_index(cursor: Any, table: str, columns: Tuple[str, ...]) -> bool:
+    """
+    Checks whether any index on the table starts with the given columns.
+    (Проверяет, есть ли у таблицы индекс, начинающийся с указанных столбцов.)
+
+    Args:
+        cursor (Any): Open cursor. (Открытый курсор)
+        table (str): Table name. (Имя таблицы)
+        columns (Tuple[str, ...]): Leading columns in order. (Начальные столбцы по порядку)
+
+    Returns:
+        bool: True if such an index exists. (True, если такой индекс есть)
+    """
+    cursor.execute(
+        """
+        SELECT INDEX_NAME, COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """,
+        (table,)
+    )
+    indexes: Dict[str, List[str]] = {}
+    for index_name, column in cursor.fetchall():
+        indexes.setdefault(index_name, []).append(column.lower())
+    wanted = [column.lower() for column in columns]
+    return any(index[:len(wanted)] == wanted for index in indexes.values())
+
+def ensure_search_indexes(
+    mysql_conn: MySQLConnection,
+    logger: Optional[MongoLogger] = None
+) -> None:
+    """
+    Creates the index backing the (release_year, film_id) ordering of search
+    pages unless an index with those leading columns already exists, under
+    any name. Failures (e.g. no ALTER privilege) are logged and ignored:
+    searches still work, only slower.
+    (Создаёт индекс для сортировки страниц поиска по (release_year, film_id),
+    если нет индекса — с любым именем — с такими начальными столбцами. Ошибки —
+    например, нет прав на изменение — логируются и пропускаются: поиск
+    работает, но медленнее.)
+
+    Args:
+        mysql_conn (MySQLConnection): Active MySQL connection. (Активное соединение)
+        logger (Optional[MongoLogger]): Logger instance. (Экземпляр логгера)
+    """
+    for table, name, columns in SEARCH_INDEXES:
+        try:
+            with mysql_conn.cursor() as cursor:
+                if not _has_index(cursor, table, columns):
+                    cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+        except MySQLError as err:
+            if logger:
+                logger.log_event(
+                    "search_index_unavailable",
+                    {
+                        "description": f"Не удалось создать индекс {name} на {table}",
+                        "error": str(err)
+                    },
+                    level="warning"
+                )
+
+def _fulltext_terms(keyword: str) -> str:
+    """
+    Converts a keyword into a BOOLEAN MODE query requiring every word as a prefix.
+    (Преобразует ключевое слово в запрос BOOLEAN MODE: каждое слово — обязательный префикс.)
+
+    Args:
+        keyword (str): User search keyword. (Ключевое слово пользователя)
+
+    Returns:
+        str: Query like "+word1* +word2*", or "" if no words remain.
+            (Запрос вида "+word1* +word2*" или "", если слов не осталось.)
+    """
+    return " ".join(f"+{word}*" for word in keyword.translate(_FULLTEXT_OPERATORS).split())
+
 def get_genre_and_years(
     mysql_conn: MySQLConnection,
     logger: Optional[MongoLogger] = None
-) -> Tuple[List[str], int, int]:
+) -> Tuple[Dict[str, int], int, int]:
     """
-    Retrieves available genres and release year range.
-    (Получает список жанров и диапазон годов выпуска из базы данных.)
+    Retrieves available genres with their category ids and release year range.
+    (Получает жанры с их идентификаторами категорий и диапазон годов выпуска из базы данных.)
 
     Args:
         mysql_conn (MySQLConnection): Active MySQL connection.
@@ -74,15 +287,21 @@ def get_genre_and_years(
         (Экземпляр логгера для отладки и логирования ошибок.)
 
     Returns:
-        Tuple[List[str], int, int]:
-            - List of genres (Список жанров),
+        Tuple[Dict[str, int], int, int]:
+            - Genre name -> category_id (Название жанра -> category_id),
             - Minimum release year (Минимальный год выпуска),
          - Maximum release year (Максимальный год выпуска)
     """
+    # Metadata rarely changes: serve from cache while fresh
+    # (Метаданные меняются редко: берём из кэша, пока он актуален)
+    cached = _META_CACHE.get(id(mysql_conn))
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+
     try:
         with mysql_conn.cursor() as cursor:
-            cursor.execute("SELECT name FROM category")
-            genres = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT name, category_id FROM category")
+            genres = dict(cursor.fetchall())
 
             cursor.execute("SELECT MIN(release_year), MAX(release_year) FROM film")
             min_year, max_year = cursor.fetchone()
@@ -97,6 +316,7 @@ def get_genre_and_years(
                 },
                 level="debug"
             )
+        _META_CACHE[id(mysql_conn)] = (time.monotonic() + METADATA_TTL, (genres, min_year, max_year))
         return genres, min_year, max_year
     except Exception as e:
         if logger:
@@ -110,115 +330,478 @@ def get_genre_and_years(
             )
         raise
 
+def page_key(record: FilmRecord) -> PageKey:
+    """
+    Returns the keyset cursor for the page that follows the given record.
+    (Возвращает ключ следующей страницы по последней показанной записи.)
+
+    Args:
+        record (FilmRecord): Last record of the current page.
+            (Последняя запись текущей страницы.)
+
+    Returns:
+        PageKey: (release_year, film_id) of the record.
+    """
+    return record.release_year, record.film_id
+
+def _keyset(after: Optional[PageKey]) -> Tuple[str, Tuple[int, ...]]:
+    """
+    Picks the _KEYSET_CLAUSES entry for a page key and its bind values.
+    (Выбирает условие из _KEYSET_CLAUSES для ключа страницы и его значения.)
+
+    Args:
+        after (Optional[PageKey]): Page key, None for the first page.
+            (Ключ страницы, None для первой страницы)
+
+    Returns:
+        Tuple[str, Tuple[int, ...]]: Page kind and bind values: ("first", ()),
+            ("dated", (year, year, film_id)) or ("undated", (film_id,)).
+            (Вид страницы и значения для подстановки.)
+    """
+    if after is None:
+        return "first", ()
+    year, film_id = after
+    if year is None:
+        return "undated", (film_id,)
+    return "dated", (year, year, film_id)
+
+# === Search SQL, rendered once at import ===
+# LIMIT is a literal (page size + 1 sentinel row), so every page of a search
+# sends byte-identical SQL and only the values are bound.
+# (LIMIT задан литералом (размер страницы + 1 строка-признак), поэтому каждая
+# страница поиска отправляет одинаковый SQL, а привязываются только значения.)
+# Keyset conditions by page kind. "dated" is the expanded form of
+# (release_year, film_id) < (%s, %s): the range optimizer does not reliably use
+# an index for row-constructor comparisons. ORDER BY ... DESC puts NULL years
+# last, so they follow every dated row and are paged by film_id alone.
+# (Условия ключа по виду страницы. "dated" — развёрнутая форма
+# (release_year, film_id) < (%s, %s): для сравнения кортежей оптимизатор не
+# всегда использует индекс. ORDER BY ... DESC ставит NULL-годы в конец, поэтому
+# они идут после всех строк с годом и листаются только по film_id.)
+_KEYSET_CLAUSES: Dict[str, str] = {
+    "first": "",
+    "dated": (
+        "AND ({p}release_year < %s OR ({p}release_year = %s AND {p}film_id < %s)"
+        " OR {p}release_year IS NULL)"
+    ),
+    "undated": "AND {p}release_year IS NULL AND {p}film_id < %s",
+}
+_FULLTEXT_CONDITION = "MATCH(title, description) AGAINST (%s IN BOOLEAN MODE)"
+_LIKE_CONDITION = "(title LIKE %s ESCAPE '!' OR description LIKE %s ESCAPE '!')"
+
+# Makes LIKE wildcards in user input literal (Экранирование символов-шаблонов LIKE во вводе)
+_LIKE_ESCAPES = str.maketrans({"!": "!!", "%": "!%", "_": "!_"})
+
+def _keyword_sql(condition: str, page: str) -> str:
+    """
+    Renders the keyword search query.
+    (Формирует SQL-запрос поиска по ключевому слову.)
+
+    Args:
+        condition (str): Match condition (FULLTEXT or LIKE). (Условие поиска)
+        page (str): Page kind, a _KEYSET_CLAUSES key. (Вид страницы, ключ _KEYSET_CLAUSES)
+
+    Returns:
+        str: SQL text. (Текст SQL-запроса)
+    """
+    return f"""
+        SELECT film_id, title, release_year, rating
+        FROM film
+        WHERE {condition}
+        {_KEYSET_CLAUSES[page].format(p="")}
+        ORDER BY release_year DESC, film_id DESC
+        LIMIT {DEFAULT_LIMIT + 1}
+    """
+
+def _genre_year_sql(page: str) -> str:
+    """
+    Renders the genre and year range search query.
+    (Формирует SQL-запрос поиска по жанру и диапазону годов.)
+
+    Args:
+        page (str): Page kind, a _KEYSET_CLAUSES key. (Вид страницы, ключ _KEYSET_CLAUSES)
+
+    Returns:
+        str: SQL text. (Текст SQL-запроса)
+    """
+    return f"""
+        SELECT f.film_id, f.title, f.release_year, f.rating
+        FROM film_category fc
+        JOIN film f ON fc.film_id = f.film_id
+        WHERE fc.category_id = %s AND f.release_year BETWEEN %s AND %s
+        {_KEYSET_CLAUSES[page].format(p="f.")}
+        ORDER BY f.release_year DESC, f.film_id DESC
+        LIMIT {DEFAULT_LIMIT + 1}
+    """
+
+# (use_fulltext, page kind) -> SQL ((FULLTEXT?, вид страницы) -> SQL)
+_KEYWORD_SQL: Dict[Tuple[bool, str], str] = {
+    (fulltext, page): _keyword_sql(_FULLTEXT_CONDITION if fulltext else _LIKE_CONDITION, page)
+    for fulltext in (False, True)
+    for page in _KEYSET_CLAUSES
+}
+
+# page kind -> SQL (вид страницы -> SQL); BETWEEN already excludes NULL years
+# (BETWEEN уже исключает фильмы без года)
+_GENRE_YEAR_SQL: Dict[str, str] = {page: _genre_year_sql(page) for page in _KEYSET_CLAUSES}
+
+# use_fulltext -> COUNT SQL (FULLTEXT? -> SQL подсчёта)
+_KEYWORD_COUNT_SQL: Dict[bool, str] = {
+    fulltext: f"SELECT COUNT(*) FROM film WHERE {_FULLTEXT_CONDITION if fulltext else _LIKE_CONDITION}"
+    for fulltext in (False, True)
+}
+
+_GENRE_YEAR_COUNT_SQL: str = """
+    SELECT COUNT(*)
+    FROM film_category fc
+    JOIN film f ON fc.film_id = f.film_id
+    WHERE fc.category_id = %s AND f.release_year BETWEEN %s AND %s
+"""
+
+def invalidate_metadata_cache() -> None:
+    """
+    Clears cached genres and year ranges.
+    (Очищает кэш жанров и диапазонов годов.)
+    """
+    _META_CACHE.clear()
+
+def _get_prepared(mysql_conn: MySQLConnection, query: str) -> MySQLCursorPrepared:
+    """
+    Returns a prepared cursor for the query, reusing it across calls so the
+    statement is parsed by MySQL only once per connection.
+    (Возвращает подготовленный курсор для запроса; курсор переиспользуется,
+    поэтому MySQL разбирает запрос один раз на соединение.)
+
+    Args:
+        mysql_conn (MySQLConnection): Active MySQL connection. (Активное соединение)
+        query (str): SQL text. (Текст SQL-запроса)
+
+    Returns:
+        MySQLCursorPrepared: Cached prepared cursor. (Подготовленный курсор из кэша)
+    """
+    cursors = _PREPARED.setdefault(mysql_conn, {})
+    cursor = cursors.get(query)
+    if cursor is None:
+        cursor = mysql_conn.cursor(prepared=True)
+        cursors[query] = cursor
+    return cursor
+
+def _drop_prepared(mysql_conn: MySQLConnection) -> None:
+    """
+    Closes and forgets the prepared cursors of a connection after an error,
+    releasing their server-side statements.
+    (Закрывает и удаляет подготовленные курсоры соединения после ошибки,
+    освобождая их операторы на сервере.)
+
+    Args:
+        mysql_conn (MySQLConnection): MySQL connection. (Соединение с MySQL)
+    """
+    for cursor in _PREPARED.pop(mysql_conn, {}).values():
+        try:
+            cursor.close()
+        except MySQLError:
+            pass
+
+def _fetch_records(cursor: MySQLCursorPrepared) -> List[FilmRecord]:
+    """
+    Fetches all rows as FilmRecord tuples without per-row dict construction.
+    (Читает все строки как кортежи FilmRecord без построения словаря на строку.)
+
+    The queries are bounded by LIMIT, and reading to the end keeps the
+    prepared cursor free of unread results for its next execution.
+    (Запросы ограничены LIMIT, а чтение до конца не оставляет
+    непрочитанных результатов для следующего выполнения курсора.)
+
+    Args:
+        cursor (MySQLCursorPrepared): Executed cursor. (Выполненный курсор)
+
+    Returns:
+        List[FilmRecord]: Fetched film records. (Полученные записи фильмов)
+    """
+    return list(map(FilmRecord._make, cursor.fetchall()))
+
+def _result_cache_get(key: tuple, cache: "OrderedDict[tuple, Any]" = _RESULT_CACHE) -> Optional[Any]:
+    """
+    Returns a cached search page (or total, with cache=_COUNT_CACHE) if present
+    and not expired (LRU order is refreshed).
+    (Возвращает страницу поиска — или итог при cache=_COUNT_CACHE — из кэша,
+    если она есть и не устарела; обновляет порядок LRU.)
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() >= entry[0]:
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return entry[1]
+
+def _result_cache_put(key: tuple, value: Any, cache: "OrderedDict[tuple, Any]" = _RESULT_CACHE) -> None:
+    """
+    Stores a search page (or total, with cache=_COUNT_CACHE), evicting the
+    least recently used entry when full.
+    (Сохраняет страницу поиска — или итог при cache=_COUNT_CACHE, — вытесняя
+    самую давно использованную запись при переполнении.)
+    """
+    cache[key] = (time.monotonic() + RESULT_CACHE_TTL, value)
+    cache.move_to_end(key)
+    if len(cache) > RESULT_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def invalidate_result_cache() -> None:
+    """
+    Clears cached search pages (e.g. after closing or replacing a connection).
+    (Очищает кэш страниц поиска, например после закрытия или замены соединения.)
+    """
+    _RESULT_CACHE.clear()
+    _COUNT_CACHE.clear()
+
+def _keyword_match(mysql_conn: MySQLConnection, keyword: str) -> Tuple[bool, Tuple[str, ...]]:
+    """
+    Chooses FULLTEXT or LIKE matching for a keyword and builds its parameters.
+    (Выбирает поиск через FULLTEXT или LIKE и формирует параметры запроса.)
+
+    Args:
+        mysql_conn (MySQLConnection): MySQL connection. (Соединение с MySQL)
+        keyword (str): Search keyword. (Ключевое слово)
+
+    Returns:
+        Tuple[bool, Tuple[str, ...]]: Whether FULLTEXT is used, and match parameters.
+            (Используется ли FULLTEXT, и параметры условия поиска.)
+    """
+    terms = _fulltext_terms(keyword) if _FULLTEXT.get(mysql_conn) else ""
+    if terms:
+        # Index-backed FULLTEXT match (Поиск по FULLTEXT-индексу)
+        return True, (terms,)
+    # '%' or '_' typed by the user must not match everything
+    # (Введённые '%' или '_' не должны совпадать со всем подряд)
+    pattern = f"%{keyword.translate(_LIKE_ESCAPES)}%"
+    return False, (pattern, pattern)
+
+def _count(
+    mysql_conn: MySQLConnection,
+    cache_key: tuple,
+    query: str,
+    params: tuple,
+    logger: Optional[MongoLogger],
+    context: str,
+    details: str
+) -> Optional[int]:
+    """
+    Runs a COUNT query once per search and caches the total.
+    (Выполняет COUNT-запрос один раз для поиска и кэширует результат.)
+
+    Args:
+        mysql_conn (MySQLConnection): MySQL connection. (Соединение с MySQL)
+        cache_key (tuple): Cache key of the search. (Ключ кэша поиска)
+        query (str): COUNT SQL. (SQL-запрос подсчёта)
+        params (tuple): Query parameters. (Параметры запроса)
+        logger (Optional[MongoLogger]): Logger. (Логгер)
+        context (str): Search context for error logs. (Контекст для лога ошибок)
+        details (str): Search details for error logs. (Детали для лога ошибок)
+
+    Returns:
+        Optional[int]: Total number of matches, None on error.
+            (Общее число совпадений, None при ошибке.)
+    """
+    cached = _result_cache_get(cache_key, _COUNT_CACHE)
+    if cached is not None:
+        return cached
+    try:
+        cursor = _get_prepared(mysql_conn, query)
+        cursor.execute(query, params)
+        (total,) = cursor.fetchall()[0]
+        _result_cache_put(cache_key, total, _COUNT_CACHE)
+        return total
+    except MySQLError as err:
+        _drop_prepared(mysql_conn)
+        log_search_error(logger, context, details, err)
+        return None
+    except Exception as e:
+        log_search_error(logger, context, details, e)
+        return None
+
+def count_by_keyword(
+    mysql_conn: MySQLConnection,
+    keyword: str,
+    logger: Optional[MongoLogger] = None
+) -> Optional[int]:
+    """
+    Returns the total number of films matching a keyword (cached per search).
+    (Возвращает общее число фильмов по ключевому слову; кэшируется для поиска.)
+
+    Args:
+        mysql_conn (MySQLConnection): MySQL connection. (Соединение с MySQL)
+        keyword (str): Search keyword. (Ключевое слово)
+        logger (Optional[MongoLogger]): Logger. (Логгер)
+
+    Returns:
+        Optional[int]: Total matches, None on error. (Число совпадений, None при ошибке)
+    """
+    fulltext, match_params = _keyword_match(mysql_conn, keyword)
+    return _count(
+        mysql_conn,
+        (id(mysql_conn), "keyword", keyword),
+        _KEYWORD_COUNT_SQL[fulltext],
+        match_params,
+        logger,
+        "keyword_count",
+        keyword
+    )
+
+def count_by_genre_and_year(
+    mysql_conn: MySQLConnection,
+    category_id: int,
+    year_from: int,
+    year_to: int,
+    logger: Optional[MongoLogger] = None
+) -> Optional[int]:
+    """
+    Returns the total number of films for a genre and year range (cached per search).
+    (Возвращает общее число фильмов по жанру и годам; кэшируется для поиска.)
+
+    Args:
+        mysql_conn (MySQLConnection): MySQL connection. (Соединение с БД)
+        category_id (int): Genre category id from get_genre_and_years.
+            (Идентификатор категории жанра из get_genre_and_years)
+        year_from (int): Start year. (Начальный год)
+        year_to (int): End year. (Конечный год)
+        logger (Optional[MongoLogger]): Logger. (Логгер)
+
+    Returns:
+        Optional[int]: Total matches, None on error. (Число совпадений, None при ошибке)
+    """
+    return _count(
+        mysql_conn,
+        (id(mysql_conn), "genre_year", category_id, year_from, year_to),
+        _GENRE_YEAR_COUNT_SQL,
+        (category_id, year_from, year_to),
+        logger,
+        "genre_year_count",
+        f"category {category_id}, {year_from}-{year_to}"
+    )
+
 def search_by_keyword(
     mysql_conn: MySQLConnection,
     keyword: str,
-    offset: int = 0,
+    after: Optional[PageKey] = None,
     logger: Optional[MongoLogger] = None
-) -> List[FilmRecord]:
+) -> Tuple[List[FilmRecord], bool]:
     """
     Searches for films by keyword in title or description.
     (Поиск фильмов по ключевому слову в названии или описании.)
 
+    Uses the FULLTEXT index (word-prefix match) when ensure_fulltext_index
+    succeeded for the connection, otherwise a LIKE substring match.
+    (Использует FULLTEXT-индекс (совпадение по началу слов), если
+    ensure_fulltext_index выполнен успешно, иначе — поиск подстроки через LIKE.)
+
+    Results are ordered by release year and id (newest first) and paginated
+    by key: each page continues after the last row of the previous one.
+    (Результаты упорядочены по году и id (сначала новые) и разбиты на страницы
+    по ключу: каждая страница продолжается после последней строки предыдущей.)
+
     Args:
         mysql_conn (MySQLConnection): MySQL connection. (Соединение с MySQL)
         keyword (str): Search keyword. (Ключевое слово)
-        offset (int): Offset for pagination. (Смещение для постраничного вывода)
+        after (Optional[PageKey]): Key of the last row on the previous page,
+            None for the first page. (Ключ последней строки предыдущей страницы)
         logger (Optional[MongoLogger]): Logger. (Логгер)
 
     Returns:
-        List[FilmRecord]: Matching film records.
+        Tuple[List[FilmRecord], bool]: Matching film records (at most DEFAULT_LIMIT)
+            and whether another page exists.
+            (Найденные фильмы — не более DEFAULT_LIMIT — и признак следующей страницы.)
     """
     if not keyword.strip():
         if logger:
             logger.log_input_error("search_by_keyword", "Пустой поисковый запрос")
-        return []
+        return [], False
 
-    try:
-        with mysql_conn.cursor(dictionary=True) as cursor:
-            query = """
-                SELECT title, release_year, rating
-                FROM film
-                WHERE title LIKE %s OR description LIKE %s
-                LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (f"%{keyword}%", f"%{keyword}%", DEFAULT_LIMIT, offset))
-            results = cursor.fetchall()
+    cache_key = (id(mysql_conn), "keyword", keyword, after)
+    cached = _result_cache_get(cache_key)
+    if cached is not None:
+        return cached
 
-        if logger:
-            logger.log_event(
-                "keyword_search",
-                {
-                    "keyword": keyword,
-                    "returned": len(results),
-                    "offset": offset,
-                    "description": f"Поиск по ключу '{keyword}' → найдено {len(results)}"
-                },
-                level="info"
-            )
-        return results
+    try:
+        fulltext, match_params = _keyword_match(mysql_conn, keyword)
+        page, keyset_params = _keyset(after)
+        query = _KEYWORD_SQL[fulltext, page]
+        params = (*match_params, *keyset_params)
+        cursor = _get_prepared(mysql_conn, query)
+        cursor.execute(query, params)
+        rows = _fetch_records(cursor)
+        # The extra row only signals that a next page exists
+        # (Лишняя строка лишь сообщает о наличии следующей страницы)
+        results, has_next = rows[:DEFAULT_LIMIT], len(rows) > DEFAULT_LIMIT
+        _result_cache_put(cache_key, (results, has_next))
+        return results, has_next
     except MySQLError as err:
+        _drop_prepared(mysql_conn)
         log_search_error(logger, "keyword", keyword, err)
-        return []
+        return [], False
     except Exception as e:
         log_search_error(logger, "keyword", keyword, e)
-        return []
+        return [], False
 
 def search_by_genre_and_year(
     mysql_conn: MySQLConnection,
-    genre: str,
+    category_id: int,
     year_from: int,
     year_to: int,
-    offset: int = 0,
+    after: Optional[PageKey] = None,
     logger: Optional[MongoLogger] = None
-) -> List[FilmRecord]:
+) -> Tuple[List[FilmRecord], bool]:
     """
     Searches films by genre and year range.
     (Поиск фильмов по жанру и диапазону годов.)
 
+    Uses the same keyset pagination as search_by_keyword. The genre is passed
+    as its category id, so film_category is filtered by integer without
+    joining the category table.
+    (Использует тот же постраничный вывод по ключу, что и search_by_keyword.
+    Жанр передаётся как id категории, поэтому film_category фильтруется
+    по числу без соединения с таблицей category.)
+
     Args:
         mysql_conn (MySQLConnection): MySQL connection. (Соединение с БД)
-        genre (str): Genre name. (Жанр)
+        category_id (int): Genre category id from get_genre_and_years.
+            (Идентификатор категории жанра из get_genre_and_years)
         year_from (int): Start year. (Начальный год)
         year_to (int): End year. (Конечный год)
-        offset (int): Offset for pagination. (Смещение постраничного вывода)
+        after (Optional[PageKey]): Key of the last row on the previous page,
+            None for the first page. (Ключ последней строки предыдущей страницы)
         logger (Optional[MongoLogger]): Logger. (Логгер)
 
     Returns:
-        List[FilmRecord]: Matching films.
+        Tuple[List[FilmRecord], bool]: Matching films (at most DEFAULT_LIMIT)
+            and whether another page exists.
+            (Найденные фильмы — не более DEFAULT_LIMIT — и признак следующей страницы.)
     """
-    try:
-        with mysql_conn.cursor(dictionary=True) as cursor:
-            query = """
-                SELECT f.title, f.release_year, f.rating
-                FROM film f
-                JOIN film_category fc ON f.film_id = fc.film_id
-                JOIN category c ON fc.category_id = c.category_id
-                WHERE c.name = %s AND f.release_year BETWEEN %s AND %s
-                LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (genre, year_from, year_to, DEFAULT_LIMIT, offset))
-            results = cursor.fetchall()
+    cache_key = (id(mysql_conn), "genre_year", category_id, year_from, year_to, after)
+    cached = _result_cache_get(cache_key)
+    if cached is not None:
+        return cached
 
-        if logger:
-            logger.log_event(
-                "genre_search",
-                {
-                    "genre": genre,
-                    "years": f"{year_from}-{year_to}",
-                    "returned": len(results),
-                    "offset": offset,
-                    "description": f"Поиск по жанру '{genre}' за {year_from}-{year_to} → найдено {len(results)}"
-                },
-                level="info"
-            )
-        return results
+    try:
+        page, keyset_params = _keyset(after)
+        query = _GENRE_YEAR_SQL[page]
+        params = (category_id, year_from, year_to, *keyset_params)
+        cursor = _get_prepared(mysql_conn, query)
+        cursor.execute(query, params)
+        rows = _fetch_records(cursor)
+        # The extra row only signals that a next page exists
+        # (Лишняя строка лишь сообщает о наличии следующей страницы)
+        results, has_next = rows[:DEFAULT_LIMIT], len(rows) > DEFAULT_LIMIT
+        _result_cache_put(cache_key, (results, has_next))
+        return results, has_next
     except MySQLError as err:
-        log_search_error(logger, "genre_year", f"{genre}, {year_from}-{year_to}", err)
-        return []
+        _drop_prepared(mysql_conn)
+        log_search_error(logger, "genre_year", f"category {category_id}, {year_from}-{year_to}", err)
+        return [], False
     except Exception as e:
-        log_search_error(logger, "genre_year", f"{genre}, {year_from}-{year_to}", e)
-        return []
+        log_search_error(logger, "genre_year", f"category {category_id}, {year_from}-{year_to}", e)
+        return [], False
 
 def log_search_error(
     logger: Optional[MongoLogger],
@@ -3,12 +3,52 @@ User Interface module
 (Модуль пользовательского интерфейса (UI))
 """
 
-from typing import List, Tuple, Optional, Dict, Set
+from typing import List, Tuple, Optional, Dict, Any, Iterable, AbstractSet, FrozenSet, TYPE_CHECKING
+from functools import lru_cache
 from formatter import format_results
-from log_writer import MongoLogger
+import os
 import sys
 
-def main_menu(logger: MongoLogger) -> int:
+# Single-key terminal input: termios/tty on POSIX, msvcrt on Windows
+# (Чтение одной клавиши: termios/tty в POSIX, msvcrt в Windows)
+try:
+    import termios
+    import tty
+    msvcrt = None
+except ImportError:
+    import msvcrt
+    termios = tty = None
+
+if TYPE_CHECKING:
+    # Annotation only: importing the UI does not load pymongo
+    # (Только для аннотаций: импорт UI не загружает pymongo)
+    from log_writer import MongoLogger
+
+# === Constants: accepted answers and menu choices ===
+_YES: FrozenSet[str] = frozenset(("y", "yes"))                # Ответы «да»
+_NO: FrozenSet[str] = frozenset(("n", "no"))                  # Ответы «нет»
+_MAIN_MENU_CHOICES: FrozenSet[int] = frozenset((1, 2, 3, 4))  # Пункты главного меню
+_MAX_CHOICE_DIGITS: int = 4                                   # Длиннее — заведомо не пункт меню
+_STATS_CHOICES: FrozenSet[str] = frozenset(("1", "2"))        # Пункты меню статистики
+
+# === Constant: input source ===
+_INTERACTIVE: bool = sys.stdin.isatty()  # Ввод с терминала (иначе — канал или файл)
+
+# === Constants: pre-rendered menus ===
+_MAIN_MENU_TEXT: str = (  # Текст главного меню
+    "\n=== МЕНЮ ===\n"
+    "1. Поиск по ключевому слову\n"
+    "2. Поиск по жанру и годам\n"
+    "3. Статистика поисков\n"
+    "4. Выход\n"
+)
+_STATS_MENU_TEXT: str = (  # Текст меню статистики
+    "\nСТАТИСТИКА:\n"
+    "1. Популярные запросы\n"
+    "2. Последние уникальные запросы\n"
+)
+
+def main_menu(logger: "MongoLogger") -> int:
     """
     Displays the main menu and returns the selected option.
     (Отображает главное меню и возвращает выбранный пункт.)
@@ -21,14 +61,10 @@ def main_menu(logger: MongoLogger) -> int:
         int: Chosen menu option.
              (Выбранный пункт меню)
     """
-    print_message("=== МЕНЮ ===")
-    print("1. Поиск по ключевому слову")
-    print("2. Поиск по жанру и годам")
-    print("3. Статистика поисков")
-    print("4. Выход")
-    return int_input_prompt("Выберите пункт (1-4): ", {1, 2, 3, 4}, logger, "main_menu")
+    _write(_MAIN_MENU_TEXT)
+    return int_input_prompt("Выберите пункт (1-4): ", _MAIN_MENU_CHOICES, logger, "main_menu")
 
-def get_keyword_input(logger: MongoLogger) -> str:
+def get_keyword_input(logger: "MongoLogger") -> str:
     """
     Requests and validates the keyword for search.
     (Запрашивает ключевое слово и проверяет его.)
@@ -47,11 +83,19 @@ def get_keyword_input(logger: MongoLogger) -> str:
         except KeyboardInterrupt:
             graceful_exit(logger)
 
+@lru_cache(maxsize=1)
+def _genre_index(genres: Tuple[str, ...]) -> Dict[str, str]:
+    """
+    Builds a normalized -> original genre lookup, reused while the genre list is unchanged.
+    (Строит словарь нормализованный жанр -> исходный жанр; переиспользуется, пока список не изменился.)
+    """
+    return {_norm(g): g for g in genres}
+
 def genre_year_input(
     genre_list: List[str],
     min_year: int,
     max_year: int,
-    logger: MongoLogger
+    logger: "MongoLogger"
 ) -> Tuple[Optional[str], int, int]:
     """
     Prompts the user to choose a genre and enter a valid year range.
@@ -61,14 +105,15 @@ def genre_year_input(
         Tuple[Optional[str], int, int]: Selected genre, year_from, year_to
                                         (Выбранный жанр, начало и конец диапазона)
     """
+    genre_map = _genre_index(tuple(genre_list))
     print_genre_list(genre_list)
     print_year_range(min_year, max_year)
     while True:
         try:
-            genre_input: str = input("Введите выбранный жанр (или 'q' для выхода): ").strip().lower()
+            genre_input: str = _norm(input("Введите выбранный жанр (или 'q' для выхода): "))
             if genre_input == "q":
                 return None, 0, 0
-            matched_genre = next((g for g in genre_list if g.lower() == genre_input), None)
+            matched_genre = genre_map.get(genre_input)
             if matched_genre:
                 break
             show_error("Ошибка: выбранный жанр отсутствует в списке. Попробуйте снова.")
@@ -93,7 +138,7 @@ def genre_year_input(
 
     return matched_genre, year_from, year_to
 
-def continue_prompt(logger: MongoLogger) -> bool:
+def continue_prompt(logger: "MongoLogger") -> bool:
     """
     Asks if the user wants to continue viewing results.
     (Запрашивает, хочет ли пользователь продолжить просмотр результатов.)
@@ -102,9 +147,11 @@ def continue_prompt(logger: MongoLogger) -> bool:
         bool: True if user agrees to continue.
               (True, если пользователь хочет продолжить)
     """
-    return yes_no_prompt("Показать ещё? (y/n): ", logger, "continue_prompt")
+    # On a terminal one key is enough, no Enter (В терминале достаточно одной клавиши, без Enter)
+    prompt = "Показать ещё? (нажмите y или n, Enter не нужен): " if _INTERACTIVE else "Показать ещё? (y/n): "
+    return yes_no_prompt(prompt, logger, "continue_prompt", single_key=True)
 
-def continue_or_menu_prompt(logger: MongoLogger) -> bool:
+def continue_or_menu_prompt(logger: "MongoLogger") -> bool:
     """
     Asks whether to continue search or return to the main menu.
     (Запрашивает, продолжить поиск или вернуться в меню.)
@@ -115,7 +162,7 @@ def continue_or_menu_prompt(logger: MongoLogger) -> bool:
     """
     return yes_no_prompt("Продолжить поиск? (y - да, n - в главное меню): ", logger, "continue_or_menu_prompt")
 
-def get_statistics_choice(logger: MongoLogger) -> str:
+def get_statistics_choice(logger: "MongoLogger") -> str:
     """
     Gets the user's choice for statistics view.
     (Получает выбор статистики: популярные или уникальные запросы.)
@@ -125,30 +172,45 @@ def get_statistics_choice(logger: MongoLogger) -> str:
              (Выбранный вариант: '1' или '2')
     """
     print_statistics_menu()
-    return str_input_prompt("Выберите вариант (1 или 2): ", {"1", "2"}, logger, "statistics_menu")
+    return str_input_prompt("Выберите вариант (1 или 2): ", _STATS_CHOICES, logger, "statistics_menu")
 
-def yes_no_prompt(prompt: str, logger: MongoLogger, context: str) -> bool:
+def yes_no_prompt(prompt: str, logger: "MongoLogger", context: str, single_key: bool = False) -> bool:
     """
     Generic yes/no input handler.
     (Обработка ввода 'да'/'нет'.)
 
+    Args:
+        single_key (bool): On a terminal, answer with a single key press
+            without Enter; piped input is still read by line.
+            (В терминале ответ одной клавишей без Enter; ввод из канала
+            по-прежнему читается построчно.)
+
     Returns:
         bool: True for yes, False for no.
               (True — да, False — нет)
     """
     while True:
         try:
-            choice = input(prompt).strip().lower()
-            if choice in {"y", "yes"}:
+            answer = _read_key(prompt) if single_key and _INTERACTIVE else input(prompt)
+            choice = _norm(answer)
+            if choice in _YES:
                 return True
-            if choice in {"n", "no"}:
+            if choice in _NO:
                 return False
             show_error("Пожалуйста, введите 'y' или 'n'.")
             logger.log_input_error(context, choice)
         except KeyboardInterrupt:
             graceful_exit(logger)
 
-def int_input_prompt(prompt: str, valid: Set[int], logger: MongoLogger, context: str) -> int:
+@lru_cache(maxsize=16)
+def _format_valid(valid: FrozenSet[Any]) -> str:
+    """
+    Returns the sorted, comma-separated list of valid options, computed once per option set.
+    (Возвращает отсортированный список допустимых значений через запятую; вычисляется один раз для набора.)
+    """
+    return ", ".join(map(str, sorted(valid)))
+
+def int_input_prompt(prompt: str, valid: AbstractSet[int], logger: "MongoLogger", context: str) -> int:
     """
     Validates user integer input against a set of valid options.
     (Проверяет целочисленный ввод пользователя.)
@@ -160,17 +222,20 @@ def int_input_prompt(prompt: str, valid: Set[int], logger: MongoLogger, context:
     while True:
         try:
             value = input(prompt).strip()
-            number = int(value)
+            # Menu options are short and non-negative, so a length and decimal
+            # check replaces int() errors (int() also rejects very long digit strings)
+            # (Пункты меню короткие и неотрицательные: проверка длины и цифр заменяет
+            # исключения int(), который отвергает и очень длинные строки цифр)
+            is_number = value.isdecimal() and len(value) <= _MAX_CHOICE_DIGITS
+            number = int(value) if is_number else None
             if number in valid:
                 return number
-            raise ValueError
-        except ValueError:
-            show_error(f"Ошибка: введите число из допустимого диапазона: {sorted(valid)}")
+            show_error(f"Ошибка: введите число из допустимого диапазона: {_format_valid(frozenset(valid))}")
             logger.log_input_error(context, value)
         except KeyboardInterrupt:
             graceful_exit(logger)
 
-def str_input_prompt(prompt: str, valid: Set[str], logger: MongoLogger, context: str) -> str:
+def str_input_prompt(prompt: str, valid: AbstractSet[str], logger: "MongoLogger", context: str) -> str:
     """
     Validates string input against a set of valid options.
     (Проверяет строковый ввод пользователя.)
@@ -184,15 +249,23 @@ def str_input_prompt(prompt: str, valid: Set[str], logger: MongoLogger, context:
             choice = input(prompt).strip()
             if choice in valid:
                 return choice
-            show_error(f"Ошибка: допустимые значения — {', '.join(valid)}.")
+            show_error(f"Ошибка: допустимые значения — {_format_valid(frozenset(valid))}.")
             logger.log_input_error(context, choice)
         except KeyboardInterrupt:
             graceful_exit(logger)
 
-def show_results(results: List[Dict]) -> None:
-    """
-    Displays search results in table format.
-    (Показывает найденные фильмы в виде таблицы.)
+def show_results(results: Iterable[Any]) -> None:
+    """
+    Displays one page of search results in table format. Paging happens
+    in the search queries (DEFAULT_LIMIT rows per page), so only the rows
+    on screen are ever fetched and formatted.
+    (Показывает одну страницу найденных фильмов в виде таблицы. Разбиение
+    на страницы выполняется в запросах поиска (DEFAULT_LIMIT строк), поэтому
+    загружаются и форматируются только строки на экране.)
+
+    Args:
+        results (Iterable[Any]): Film records of the page, consumed once.
+            (Записи фильмов страницы, читаются один раз.)
     """
     format_results(results, mode="movies")
 
@@ -217,14 +290,95 @@ def print_separator() -> None:
     """
     print("\n" + "-" * 40)
 
+def _read_key(prompt: str) -> str:
+    """
+    Shows a prompt and reads a single key press from the terminal without
+    waiting for Enter; the key is echoed back. Enter presses are ignored and
+    anything typed after the key is discarded, so a habitual Enter does not
+    leak into the next prompt.
+    (Показывает приглашение и читает одну клавишу из терминала без ожидания
+    Enter; нажатая клавиша выводится на экран. Нажатия Enter пропускаются,
+    а всё введённое после клавиши отбрасывается, чтобы лишний Enter не попал
+    в следующий запрос.)
+
+    Args:
+        prompt (str): Prompt text. (Текст приглашения)
+
+    Returns:
+        str: Pressed key. (Нажатая клавиша)
+
+    Raises:
+        KeyboardInterrupt: Ctrl+C was pressed. (Нажато Ctrl+C)
+        EOFError: The terminal was closed. (Терминал закрыт)
+    """
+    _write(prompt)
+    if msvcrt is not None:
+        key = "\r"
+        while key in "\r\n":
+            key = msvcrt.getwch()
+            if key == "\x03":
+                raise KeyboardInterrupt
+        while msvcrt.kbhit():
+            msvcrt.getwch()
+    else:
+        # cbreak keeps signal keys, so Ctrl+C still raises KeyboardInterrupt;
+        # reading the fd directly keeps extra input out of sys.stdin's buffer
+        # (Режим cbreak сохраняет сигнальные клавиши: Ctrl+C вызывает
+        # KeyboardInterrupt; чтение из дескриптора не оставляет лишний ввод
+        # в буфере sys.stdin)
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            key = ""
+            while not key:
+                data = os.read(fd, 32)
+                if not data:
+                    # Hangup or end of input, as input() reports it
+                    # (Обрыв связи или конец ввода — как в input())
+                    raise EOFError
+                key = data.decode(errors="ignore").lstrip("\r\n")[:1]
+            termios.tcflush(fd, termios.TCIFLUSH)
+        finally:
+            try:
+                termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+            except termios.error:
+                # Terminal already gone: nothing to restore
+                # (Терминал уже закрыт: восстанавливать нечего)
+                pass
+    _write(key + "\n")
+    return key
+
+def _norm(text: str) -> str:
+    """
+    Normalizes user input for case-insensitive comparison (casefold also
+    handles Cyrillic and other non-ASCII letters correctly).
+    (Нормализует ввод для сравнения без учёта регистра; casefold корректно
+    обрабатывает кириллицу и другие символы вне ASCII.)
+    """
+    return text.strip().casefold()
+
+def _write(text: str) -> None:
+    """
+    Writes text to stdout with a single write and flush.
+    (Выводит текст в stdout одной записью и одним сбросом буфера.)
+    """
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+def _flush_block(lines: List[str]) -> None:
+    """
+    Writes several lines to stdout with a single write and flush.
+    (Выводит несколько строк в stdout одной записью и одним сбросом буфера.)
+    """
+    _write("\n".join(lines) + "\n")
+
 def print_genre_list(genre_list: List[str]) -> None:
     """
     Displays available genres.
     (Показывает список жанров.)
     """
-    print_message("Доступные жанры:")
-    for genre in genre_list:
-        print(f"- {genre}")
+    _flush_block(["", "Доступные жанры:", *(f"- {genre}" for genre in genre_list)])
 
 def print_year_range(min_year: int, max_year: int) -> None:
     """
@@ -238,15 +392,14 @@ def print_statistics_menu() -> None:
     Displays the statistics menu options.
     (Отображает меню статистики.)
     """
-    print_message("СТАТИСТИКА:")
-    print("1. Популярные запросы")
-    print("2. Последние уникальные запросы")
+    _write(_STATS_MENU_TEXT)
 
-def graceful_exit(logger: MongoLogger) -> None:
+def graceful_exit(logger: "MongoLogger") -> None:
     """
     Handles graceful exit on KeyboardInterrupt (Ctrl+C).
     (Корректный выход при прерывании программы через Ctrl+C.)
     """
     print("\n\n[INFO] Работа приложения прервана пользователем. До свидания!")
     logger.log_event("shutdown", {"description": "Приложение завершено пользователем через Ctrl+C"}, level="info")
+    logger.close()
     sys.exit(0)
\ No newline at end of file